@@ -16,6 +16,7 @@ DFT convention (matches numpy.fft.fft):
 from __future__ import annotations
 
 import argparse
+import collections
 import dataclasses
 import datetime as dt
 import json
@@ -35,6 +36,17 @@ def try_import_scipy_windows():
     return None
 
 
+def try_import_scipy_rfft():
+  try:
+    from scipy.fft import rfft as sp_rfft  # type: ignore
+    return sp_rfft
+  except Exception:
+    return None
+
+
+SCIPY_WINDOWS = ("hann", "hamming", "blackman")
+
+
 def window_rect(n: int) -> np.ndarray:
   return np.ones(n, dtype=np.float64)
 
@@ -84,13 +96,60 @@ def generate_bin_centered_sine(
   return amplitude * np.sin((2.0 * np.pi * k * idx) / n - phase)
 
 
-def fft_reference(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-  X = np.fft.fft(x.astype(np.float64))
-  return X.real.astype(np.float64), X.imag.astype(np.float64)
+def mirror_half_spectrum(X: np.ndarray, n: int) -> np.ndarray:
+  # Bins N/2+1..N-1 of a real signal's DFT are conj(X[N-k]).
+  tail = np.conj(X[..., 1 : n - n // 2][..., ::-1])
+  return np.concatenate([X, tail], axis=-1)
+
+
+def fft_reference_batch(xs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+  # One rfft over a (cases, N) batch, mirrored to the full N-bin layout the
+  # TypeScript fixtures expect. SciPy's pocketfft can spread the batch across
+  # cores (workers=-1); NumPy's rfft is the single-threaded fallback.
+  n = xs.shape[-1]
+  sp_rfft = try_import_scipy_rfft()
+  if sp_rfft is not None:
+    half = sp_rfft(xs, axis=-1, workers=-1)
+  else:
+    half = np.fft.rfft(xs, axis=-1)
+  X = mirror_half_spectrum(half, n)
+  return X.real, X.imag
+
+
+def fft_reference_cases(
+  cases: List["FFTCaseSpec"],
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+  # Group cases by N so each group shares a single batched transform.
+  by_n: Dict[int, List[int]] = collections.defaultdict(list)
+  for i, c in enumerate(cases):
+    by_n[c.n].append(i)
+
+  out: List[Tuple[np.ndarray, np.ndarray]] = [None] * len(cases)  # type: ignore[list-item]
+  for indices in by_n.values():
+    xs = np.stack([cases[i].input for i in indices]).astype(np.float64, copy=False)
+    re, im = fft_reference_batch(xs)
+    for row, i in enumerate(indices):
+      out[i] = (re[row], im[row])
+  return out
+
+
+def json_default(obj: Any) -> Any:
+  # Arrays stay in the payload until encoding; tolist() already yields Python
+  # floats, so there is no per-element float() pass.
+  if isinstance(obj, np.ndarray):
+    return obj.tolist()
+  if isinstance(obj, np.generic):
+    return obj.item()
+  raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
-def to_float_list(arr: np.ndarray) -> List[float]:
-  return [float(x) for x in arr.tolist()]
+def write_json(path: str, payload: Dict[str, Any], *, compact: bool) -> None:
+  with open(path, "w", encoding="utf-8") as f:
+    if compact:
+      json.dump(payload, f, separators=(",", ":"), default=json_default)
+    else:
+      json.dump(payload, f, indent=2, default=json_default)
+    f.write("\n")
 
 
 def utc_now_iso() -> str:
@@ -117,10 +176,18 @@ def build_cases(
 ) -> List[FFTCaseSpec]:
   cases: List[FFTCaseSpec] = []
 
+  # Draw every random input in one call and hand out contiguous slices. The
+  # generator stream is the same as drawing per case in this order, so the
+  # fixtures stay identical for a given seed.
+  total = sum(small_sizes) * small_cases_per_size + sum(bench_sizes)
+  pool = rng.standard_normal(total)
+  offset = 0
+
   # Random small cases for correctness against DFT/NumPy FFT.
   for n in small_sizes:
     for i in range(small_cases_per_size):
-      x = rng.standard_normal(n).astype(np.float64)
+      x = pool[offset : offset + n]
+      offset += n
       cases.append(
         FFTCaseSpec(
           name=f"rand_n{n}_{i}",
@@ -147,7 +214,8 @@ def build_cases(
 
   # Benchmark cases: 1 random per bench size (stable inputs).
   for n in bench_sizes:
-    x = rng.standard_normal(n).astype(np.float64)
+    x = pool[offset : offset + n]
+    offset += n
     cases.append(
       FFTCaseSpec(
         name=f"bench_rand_n{n}",
@@ -176,17 +244,8 @@ def build_windows(
     for n in sizes:
       # Prefer SciPy if present so we align with a canonical implementation,
       # but fall back to our formula (sym=True equivalent) if SciPy is absent.
-      if sp_windows is not None:
-        if wtype == "rect":
-          w = np.ones(n, dtype=np.float64)
-        elif wtype == "hann":
-          w = sp_windows.hann(n, sym=True).astype(np.float64)
-        elif wtype == "hamming":
-          w = sp_windows.hamming(n, sym=True).astype(np.float64)
-        elif wtype == "blackman":
-          w = sp_windows.blackman(n, sym=True).astype(np.float64)
-        else:
-          w = WINDOW_FORMULAS[wtype](n)
+      if sp_windows is not None and wtype in SCIPY_WINDOWS:
+        w = getattr(sp_windows, wtype)(n, sym=True).astype(np.float64, copy=False)
       else:
         w = WINDOW_FORMULAS[wtype](n)
 
@@ -195,7 +254,7 @@ def build_windows(
           "type": wtype,
           "n": int(n),
           "sym": True,
-          "values": to_float_list(w),
+          "values": w,
         }
       )
 
@@ -269,6 +328,11 @@ def main() -> int:
     default=0.8,
     help="Amplitude for the bin-centered sine fixture",
   )
+  p.add_argument(
+    "--compact",
+    action="store_true",
+    help="Write compact JSON (no indentation) for faster emission",
+  )
   p.add_argument(
     "--overwrite",
     action="store_true",
@@ -299,17 +363,16 @@ def main() -> int:
   )
 
   fft_cases: List[Dict[str, Any]] = []
-  for c in cases:
-    re, im = fft_reference(c.input)
+  for c, (re, im) in zip(cases, fft_reference_cases(cases)):
     fft_cases.append(
       {
         "name": c.name,
         "kind": c.kind,
         "n": int(c.n),
         "sampleRate": float(c.sample_rate),
-        "input": to_float_list(c.input),
-        "fftRe": to_float_list(re),
-        "fftIm": to_float_list(im),
+        "input": c.input,
+        "fftRe": re,
+        "fftIm": im,
         "meta": (
           {
             "binCenteredK": int(args.sine_k),
@@ -356,9 +419,7 @@ def main() -> int:
   }
 
   ensure_dir(os.path.dirname(out_path) or ".")
-  with open(out_path, "w", encoding="utf-8") as f:
-    json.dump(payload, f, indent=2, sort_keys=False)
-    f.write("\n")
+  write_json(out_path, payload, compact=args.compact)
 
   print(f"Wrote fixtures: {out_path}")
   return 0
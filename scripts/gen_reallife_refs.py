@@ -14,13 +14,16 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
 import json
 import os
 import platform
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
+from scipy.fft import rfft as sp_rfft
 from scipy.signal import windows as sp_windows
 
 
@@ -28,8 +31,73 @@ def utc_now_iso() -> str:
     return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat()
 
 
-def to_float_list(arr: np.ndarray) -> list[float]:
-    return [float(x) for x in arr.tolist()]
+def json_default(obj: Any) -> Any:
+    """Serialize NumPy values the JSON encoder does not handle natively."""
+    if isinstance(obj, np.ndarray):
+        # tolist() already yields Python floats; no per-element float() pass.
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def externalize_arrays(payload: Any, bin_path: str) -> Any:
+    """Move every ndarray in payload into a raw little-endian float64 file.
+
+    Each array is replaced by a reference the TypeScript loaders resolve:
+    {"$sidecar": <file name>, "dtype": "float64", "offset": <elements>,
+    "length": <elements>}. float64 is kept because the tests compare FFT
+    output at 1e-10 tolerance.
+    """
+    name = os.path.basename(bin_path)
+    offset = 0
+
+    with open(bin_path, "wb") as f:
+
+        def visit(obj: Any) -> Any:
+            nonlocal offset
+            if isinstance(obj, np.ndarray):
+                data = np.ascontiguousarray(obj, dtype="<f8")
+                data.tofile(f)
+                ref = {
+                    "$sidecar": name,
+                    "dtype": "float64",
+                    "offset": offset,
+                    "length": int(data.size),
+                }
+                offset += data.size
+                return ref
+            if isinstance(obj, dict):
+                return {k: visit(v) for k, v in obj.items()}
+            if isinstance(obj, list):
+                return [visit(v) for v in obj]
+            return obj
+
+        return visit(payload)
+
+
+def write_json(
+    path: str,
+    payload: dict[str, Any],
+    *,
+    compact: bool = False,
+    sidecar: bool = False,
+) -> None:
+    """Write payload as JSON, keeping ndarrays unboxed until encoding.
+
+    Output is indented by 2 spaces unless ``compact`` is set. With
+    ``sidecar``, arrays go to a ``<name>.f64.bin`` file next to the JSON
+    instead.
+    """
+    if sidecar:
+        bin_path = os.path.splitext(path)[0] + ".f64.bin"
+        payload = externalize_arrays(payload, bin_path)
+
+    with open(path, "w") as f:
+        if compact:
+            json.dump(payload, f, separators=(",", ":"), default=json_default)
+        else:
+            json.dump(payload, f, indent=2, default=json_default)
 
 
 def generator_meta() -> dict[str, Any]:
@@ -50,6 +118,14 @@ def generator_meta() -> dict[str, Any]:
 # =============================================================================
 
 
+@functools.lru_cache(maxsize=None)
+def _time_axis(n: int, sample_rate: float) -> np.ndarray:
+    """Return the shared, read-only sample times t[i] = i / sample_rate."""
+    t = np.arange(n, dtype=np.float64) / sample_rate
+    t.flags.writeable = False
+    return t
+
+
 def generate_sine(
     freq_hz: float,
     amplitude: float,
@@ -58,7 +134,7 @@ def generate_sine(
     n: int,
 ) -> np.ndarray:
     """Generate a sine wave: A * sin(2*pi*f*t + phase)"""
-    t = np.arange(n, dtype=np.float64) / sample_rate
+    t = _time_axis(n, sample_rate)
     return amplitude * np.sin(2 * np.pi * freq_hz * t + phase_rad)
 
 
@@ -70,7 +146,7 @@ def generate_cosine(
     n: int,
 ) -> np.ndarray:
     """Generate a cosine wave: A * cos(2*pi*f*t + phase)"""
-    t = np.arange(n, dtype=np.float64) / sample_rate
+    t = _time_axis(n, sample_rate)
     return amplitude * np.cos(2 * np.pi * freq_hz * t + phase_rad)
 
 
@@ -82,11 +158,15 @@ def generate_multi_tone(
     n: int,
 ) -> np.ndarray:
     """Generate sum of multiple sine waves."""
-    t = np.arange(n, dtype=np.float64) / sample_rate
-    signal = np.zeros(n, dtype=np.float64)
-    for freq, amp, phase in zip(freqs_hz, amplitudes, phases_rad):
-        signal += amp * np.sin(2 * np.pi * freq * t + phase)
-    return signal
+    t = _time_axis(n, sample_rate)
+    freqs = np.asarray(freqs_hz, dtype=np.float64)
+    phases = np.asarray(phases_rad, dtype=np.float64)
+    # One (tones, n) buffer holds the phases and then, in place, their sines;
+    # a single GEMV applies the amplitudes and sums the tones.
+    tones = np.outer(2 * np.pi * freqs, t)
+    tones += phases[:, None]
+    np.sin(tones, out=tones)
+    return np.asarray(amplitudes, dtype=np.float64) @ tones
 
 
 def generate_chirp(
@@ -97,12 +177,19 @@ def generate_chirp(
     amplitude: float = 1.0,
 ) -> np.ndarray:
     """Generate a linear chirp from f0 to f1."""
-    t = np.arange(n, dtype=np.float64) / sample_rate
+    t = _time_axis(n, sample_rate)
     duration = n / sample_rate
     # Linear chirp: f(t) = f0 + (f1 - f0) * t / T
     # phase = 2*pi * integral of f(t) = 2*pi * (f0*t + (f1-f0)*t^2/(2*T))
-    phase = 2 * np.pi * (f0_hz * t + (f1_hz - f0_hz) * t**2 / (2 * duration))
-    return amplitude * np.sin(phase)
+    # Evaluated in Horner form, 2*pi * t * (f0 + (f1-f0)*t/(2*T)), in place in
+    # one scratch buffer that ends up holding the signal.
+    signal = np.multiply(t, (f1_hz - f0_hz) / (2 * duration))
+    signal += f0_hz
+    signal *= t
+    signal *= 2 * np.pi
+    np.sin(signal, out=signal)
+    signal *= amplitude
+    return signal
 
 
 def generate_impulse(n: int, position: int = 0, amplitude: float = 1.0) -> np.ndarray:
@@ -119,9 +206,9 @@ def generate_dc(n: int, level: float = 1.0) -> np.ndarray:
 
 def generate_nyquist(n: int, amplitude: float = 1.0) -> np.ndarray:
     """Generate alternating +1/-1 (Nyquist frequency signal)."""
-    signal = np.zeros(n, dtype=np.float64)
-    for i in range(n):
-        signal[i] = amplitude * ((-1) ** i)
+    signal = np.empty(n, dtype=np.float64)
+    signal[0::2] = amplitude
+    signal[1::2] = -amplitude
     return signal
 
 
@@ -130,15 +217,28 @@ def generate_nyquist(n: int, amplitude: float = 1.0) -> np.ndarray:
 # =============================================================================
 
 
-def compute_fft(signal: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    """Compute FFT and return (real, imag) arrays."""
-    X = np.fft.fft(signal.astype(np.float64))
-    return X.real.astype(np.float64), X.imag.astype(np.float64)
+def mirror_half_spectrum(X: np.ndarray, n: int) -> np.ndarray:
+    """Expand an rfft half spectrum to all N bins via conjugate symmetry."""
+    tail = np.conj(X[..., 1 : n - n // 2][..., ::-1])
+    return np.concatenate([X, tail], axis=-1)
+
+
+def compute_fft_batch(signals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the FFT of each row of a (cases, N) real batch in one call.
+
+    Uses scipy.fft so pocketfft can spread the batch across all cores. The
+    TypeScript tests compare against full N-bin spectra, so the rfft output
+    is mirrored back to the full layout.
+    """
+    n = signals.shape[-1]
+    X = mirror_half_spectrum(sp_rfft(signals, axis=-1, workers=-1), n)
+    return X.real, X.imag
 
 
 def compute_magnitude(fft_re: np.ndarray, fft_im: np.ndarray) -> np.ndarray:
     """Compute magnitude from real/imag components."""
-    return np.sqrt(fft_re**2 + fft_im**2)
+    # One fused pass with a single output; no re**2/im**2 temporaries.
+    return np.hypot(fft_re, fft_im)
 
 
 def compute_phase(fft_re: np.ndarray, fft_im: np.ndarray) -> np.ndarray:
@@ -146,11 +246,15 @@ def compute_phase(fft_re: np.ndarray, fft_im: np.ndarray) -> np.ndarray:
     return np.arctan2(fft_im, fft_re)
 
 
-def find_peak_bin(magnitude: np.ndarray, exclude_dc: bool = True) -> int:
-    """Find the bin with maximum magnitude."""
-    if exclude_dc and len(magnitude) > 1:
-        return int(np.argmax(magnitude[1:])) + 1
-    return int(np.argmax(magnitude))
+def find_peak_bins(magnitude: np.ndarray, exclude_dc: np.ndarray) -> np.ndarray:
+    """Find the max-magnitude bin of each row of a (cases, N) magnitude matrix.
+
+    Bin 0 is skipped for rows where ``exclude_dc`` is set.
+    """
+    peaks = np.argmax(magnitude, axis=1)
+    if magnitude.shape[1] > 1:
+        peaks = np.where(exclude_dc, np.argmax(magnitude[:, 1:], axis=1) + 1, peaks)
+    return peaks
 
 
 # =============================================================================
@@ -167,6 +271,15 @@ class SignalCase:
     params: dict[str, Any]
 
 
+@dataclass
+class CaseSpectrum:
+    fft_re: np.ndarray
+    fft_im: np.ndarray
+    magnitude: np.ndarray
+    peak_bin: int
+    peak_magnitude: float
+
+
 def build_pure_sine_cases(sample_rate: float, n: int) -> list[SignalCase]:
     """Build test cases for pure sine waves."""
     cases: list[SignalCase] = []
@@ -453,6 +566,21 @@ def build_special_cases(sample_rate: float, n: int) -> list[SignalCase]:
     return cases
 
 
+def get_window(wtype: str, n: int) -> np.ndarray:
+    """Return the symmetric window of the given type and length."""
+    if wtype == "rect":
+        w = np.ones(n, dtype=np.float64)
+    elif wtype == "hann":
+        w = sp_windows.hann(n, sym=True).astype(np.float64, copy=False)
+    elif wtype == "hamming":
+        w = sp_windows.hamming(n, sym=True).astype(np.float64, copy=False)
+    elif wtype == "blackman":
+        w = sp_windows.blackman(n, sym=True).astype(np.float64, copy=False)
+    else:
+        raise ValueError(f"Unknown window type: {wtype}")
+    return w
+
+
 def build_window_dsp_cases(sizes: list[int]) -> list[dict[str, Any]]:
     """Build window DSP property test cases."""
     window_types = ["rect", "hann", "hamming", "blackman"]
@@ -460,28 +588,23 @@ def build_window_dsp_cases(sizes: list[int]) -> list[dict[str, Any]]:
 
     for n in sizes:
         for wtype in window_types:
-            if wtype == "rect":
-                w = np.ones(n, dtype=np.float64)
-            elif wtype == "hann":
-                w = sp_windows.hann(n, sym=True).astype(np.float64)
-            elif wtype == "hamming":
-                w = sp_windows.hamming(n, sym=True).astype(np.float64)
-            elif wtype == "blackman":
-                w = sp_windows.blackman(n, sym=True).astype(np.float64)
-            else:
-                continue
+            w = get_window(wtype, n)
+
+            # sum(w^2) as a dot product avoids allocating a w**2 temporary.
+            sum_w = float(w.sum())
+            sum_w2 = float(np.dot(w, w))
 
             # Coherent gain: sum(w) / N
-            coherent_gain = float(np.sum(w) / n)
+            coherent_gain = sum_w / n
 
             # ENBW: N * sum(w^2) / sum(w)^2
-            enbw = float(n * np.sum(w**2) / np.sum(w) ** 2)
+            enbw = n * sum_w2 / (sum_w * sum_w)
 
             cases.append(
                 {
                     "type": wtype,
                     "n": n,
-                    "values": to_float_list(w),
+                    "values": w,
                     "coherentGain": coherent_gain,
                     "enbw": enbw,
                 }
@@ -495,28 +618,125 @@ def build_window_dsp_cases(sizes: list[int]) -> list[dict[str, Any]]:
 # =============================================================================
 
 
-def case_to_dict(case: SignalCase) -> dict[str, Any]:
-    """Convert a SignalCase to a dictionary for JSON output."""
-    fft_re, fft_im = compute_fft(case.signal)
-    magnitude = compute_magnitude(fft_re, fft_im)
-    phase = compute_phase(fft_re, fft_im)
-    peak_bin = find_peak_bin(magnitude, exclude_dc=(case.kind != "dc"))
+def analytic_fft(case: SignalCase) -> tuple[np.ndarray, np.ndarray] | None:
+    """Return the exact (real, imag) spectrum for closed-form cases, else None."""
+    n = len(case.signal)
+    if case.kind == "impulse":
+        # DFT of A * delta[i - p] is A * exp(-j*2*pi*p*k/N). Only p = 0 and
+        # p = N/2 give an exactly real spectrum (A, or A * (-1)**k) that the
+        # closed form reproduces bit for bit; other shifts go through the FFT.
+        position = case.params["position"]
+        if (2 * position) % n != 0:
+            return None
+        amplitude = case.params["amplitude"]
+        fft_re = np.full(n, amplitude, dtype=np.float64)
+        if position != 0:
+            fft_re[1::2] = -amplitude
+        return fft_re, np.zeros(n, dtype=np.float64)
+    if case.kind == "dc":
+        # DFT of a constant is N * level at bin 0 and exactly zero elsewhere.
+        fft_re = np.zeros(n, dtype=np.float64)
+        fft_re[0] = n * case.params["level"]
+        return fft_re, np.zeros(n, dtype=np.float64)
+    if case.kind == "zeros":
+        return np.zeros(n, dtype=np.float64), np.zeros(n, dtype=np.float64)
+    return None
+
+
+def compute_case_spectra(cases: list[SignalCase]) -> list[CaseSpectrum]:
+    """Compute spectra and peaks for many cases, batched per signal length.
+
+    Cases with a closed-form spectrum (see ``analytic_fft``) skip the FFT.
+    Magnitude and peak bins are computed for each equal-N group at once.
+    """
+    by_n: defaultdict[int, list[int]] = defaultdict(list)
+    for i, case in enumerate(cases):
+        by_n[len(case.signal)].append(i)
+
+    spectra: list[CaseSpectrum] = [None] * len(cases)  # type: ignore[list-item]
+    for n, indices in by_n.items():
+        fft_re = np.empty((len(indices), n), dtype=np.float64)
+        fft_im = np.empty((len(indices), n), dtype=np.float64)
+        fft_rows: list[int] = []
+        for row, i in enumerate(indices):
+            exact = analytic_fft(cases[i])
+            if exact is None:
+                fft_rows.append(row)
+            else:
+                fft_re[row], fft_im[row] = exact
+
+        if fft_rows:
+            batch = np.stack([cases[indices[row]].signal for row in fft_rows])
+            batch_re, batch_im = compute_fft_batch(batch.astype(np.float64, copy=False))
+            fft_re[fft_rows] = batch_re
+            fft_im[fft_rows] = batch_im
+
+        magnitude = compute_magnitude(fft_re, fft_im)
+        exclude_dc = np.array([cases[i].kind != "dc" for i in indices])
+        peak_bins = find_peak_bins(magnitude, exclude_dc)
+        peak_mags = magnitude[np.arange(len(indices)), peak_bins]
+        for row, i in enumerate(indices):
+            spectra[i] = CaseSpectrum(
+                fft_re[row],
+                fft_im[row],
+                magnitude[row],
+                int(peak_bins[row]),
+                float(peak_mags[row]),
+            )
+    return spectra
+
 
-    return {
+def case_to_dict(
+    case: SignalCase,
+    spectrum: CaseSpectrum,
+    emit_derived: bool = False,
+) -> dict[str, Any]:
+    """Convert a SignalCase to a dictionary for JSON output.
+
+    ``spectrum`` is the case's entry from ``compute_case_spectra``.
+    Magnitude and phase are only emitted when ``emit_derived`` is set; the
+    TypeScript loaders recompute them from fftRe/fftIm otherwise.
+    """
+    fft_re, fft_im = spectrum.fft_re, spectrum.fft_im
+    peak_bin = spectrum.peak_bin
+
+    out: dict[str, Any] = {
         "name": case.name,
         "kind": case.kind,
         "n": len(case.signal),
         "sampleRate": case.sample_rate,
-        "signal": to_float_list(case.signal),
-        "fftRe": to_float_list(fft_re),
-        "fftIm": to_float_list(fft_im),
-        "magnitude": to_float_list(magnitude),
-        "phase": to_float_list(phase),
-        "peakBin": peak_bin,
-        "peakMagnitude": float(magnitude[peak_bin]),
-        "peakPhase": float(phase[peak_bin]),
-        "params": case.params,
+        "signal": case.signal,
+        "fftRe": fft_re,
+        "fftIm": fft_im,
     }
+    if emit_derived:
+        phase = compute_phase(fft_re, fft_im)
+        out["magnitude"] = spectrum.magnitude
+        out["phase"] = phase
+        peak_phase = float(phase[peak_bin])
+    else:
+        # Only the peak bin's phase is needed; skip the full N-point arctan2.
+        peak_phase = float(np.arctan2(fft_im[peak_bin], fft_re[peak_bin]))
+    out.update(
+        {
+            "peakBin": peak_bin,
+            "peakMagnitude": spectrum.peak_magnitude,
+            "peakPhase": peak_phase,
+            "params": case.params,
+        }
+    )
+    return out
+
+
+def cases_to_dicts(
+    cases: list[SignalCase], emit_derived: bool = False
+) -> list[dict[str, Any]]:
+    """Convert SignalCases to dictionaries, batching the FFT per signal length."""
+    spectra = compute_case_spectra(cases)
+    return [
+        case_to_dict(c, spectrum, emit_derived)
+        for c, spectrum in zip(cases, spectra)
+    ]
 
 
 def generate_all_references(
@@ -524,6 +744,9 @@ def generate_all_references(
     sample_rate: float = 48000.0,
     n: int = 1024,
     window_sizes: list[int] | None = None,
+    emit_derived: bool = False,
+    compact: bool = False,
+    sidecar: bool = False,
 ) -> None:
     """Generate all reference files."""
     os.makedirs(out_dir, exist_ok=True)
@@ -540,10 +763,14 @@ def generate_all_references(
         "description": "Pure sine wave test cases",
         "n": n,
         "sampleRate": sample_rate,
-        "cases": [case_to_dict(c) for c in sine_cases],
+        "cases": cases_to_dicts(sine_cases, emit_derived),
     }
-    with open(os.path.join(out_dir, "pure_sine.json"), "w") as f:
-        json.dump(sine_output, f, indent=2)
+    write_json(
+        os.path.join(out_dir, "pure_sine.json"),
+        sine_output,
+        compact=compact,
+        sidecar=sidecar,
+    )
     print(f"Wrote {len(sine_cases)} cases to pure_sine.json")
 
     # Cosine cases (for phase reference)
@@ -553,10 +780,14 @@ def generate_all_references(
         "description": "Cosine wave test cases for phase reference",
         "n": n,
         "sampleRate": sample_rate,
-        "cases": [case_to_dict(c) for c in cosine_cases],
+        "cases": cases_to_dicts(cosine_cases, emit_derived),
     }
-    with open(os.path.join(out_dir, "cosine.json"), "w") as f:
-        json.dump(cosine_output, f, indent=2)
+    write_json(
+        os.path.join(out_dir, "cosine.json"),
+        cosine_output,
+        compact=compact,
+        sidecar=sidecar,
+    )
     print(f"Wrote {len(cosine_cases)} cases to cosine.json")
 
     # Multi-tone cases
@@ -566,10 +797,14 @@ def generate_all_references(
         "description": "Multi-tone signal test cases",
         "n": n,
         "sampleRate": sample_rate,
-        "cases": [case_to_dict(c) for c in multi_cases],
+        "cases": cases_to_dicts(multi_cases, emit_derived),
     }
-    with open(os.path.join(out_dir, "multi_tone.json"), "w") as f:
-        json.dump(multi_output, f, indent=2)
+    write_json(
+        os.path.join(out_dir, "multi_tone.json"),
+        multi_output,
+        compact=compact,
+        sidecar=sidecar,
+    )
     print(f"Wrote {len(multi_cases)} cases to multi_tone.json")
 
     # Chirp cases
@@ -579,10 +814,14 @@ def generate_all_references(
         "description": "Chirp signal test cases",
         "n": n,
         "sampleRate": sample_rate,
-        "cases": [case_to_dict(c) for c in chirp_cases],
+        "cases": cases_to_dicts(chirp_cases, emit_derived),
     }
-    with open(os.path.join(out_dir, "chirp.json"), "w") as f:
-        json.dump(chirp_output, f, indent=2)
+    write_json(
+        os.path.join(out_dir, "chirp.json"),
+        chirp_output,
+        compact=compact,
+        sidecar=sidecar,
+    )
     print(f"Wrote {len(chirp_cases)} cases to chirp.json")
 
     # Special cases (impulse, DC, Nyquist, zeros, edge values)
@@ -592,10 +831,14 @@ def generate_all_references(
         "description": "Special signal test cases (impulse, DC, Nyquist, edge values)",
         "n": n,
         "sampleRate": sample_rate,
-        "cases": [case_to_dict(c) for c in special_cases],
+        "cases": cases_to_dicts(special_cases, emit_derived),
     }
-    with open(os.path.join(out_dir, "special.json"), "w") as f:
-        json.dump(special_output, f, indent=2)
+    write_json(
+        os.path.join(out_dir, "special.json"),
+        special_output,
+        compact=compact,
+        sidecar=sidecar,
+    )
     print(f"Wrote {len(special_cases)} cases to special.json")
 
     # Window DSP properties
@@ -605,8 +848,12 @@ def generate_all_references(
         "description": "Window function DSP properties",
         "cases": window_cases,
     }
-    with open(os.path.join(out_dir, "windows_dsp.json"), "w") as f:
-        json.dump(window_output, f, indent=2)
+    write_json(
+        os.path.join(out_dir, "windows_dsp.json"),
+        window_output,
+        compact=compact,
+        sidecar=sidecar,
+    )
     print(f"Wrote {len(window_cases)} cases to windows_dsp.json")
 
 
@@ -634,6 +881,21 @@ def main() -> int:
         default="64,256,1024,2048",
         help="Comma-separated window sizes for DSP property tests",
     )
+    p.add_argument(
+        "--emit-derived",
+        action="store_true",
+        help="Also emit per-bin magnitude/phase (derivable from fftRe/fftIm)",
+    )
+    p.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write compact JSON (no indentation) for faster emission",
+    )
+    p.add_argument(
+        "--binary-sidecars",
+        action="store_true",
+        help="Write arrays to raw float64 .f64.bin files next to each JSON",
+    )
     args = p.parse_args()
 
     window_sizes = [int(x) for x in args.window_sizes.split(",") if x.strip()]
@@ -643,6 +905,9 @@ def main() -> int:
         sample_rate=args.sample_rate,
         n=args.n,
         window_sizes=window_sizes,
+        emit_derived=args.emit_derived,
+        compact=args.compact,
+        sidecar=args.binary_sidecars,
     )
 
     return 0
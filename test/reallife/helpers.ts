@@ -41,6 +41,19 @@ export type SignalReference = {
   cases: SignalCase[];
 };
 
+/**
+ * A case as stored on disk: magnitude/phase are only present when the
+ * generator ran with --emit-derived.
+ */
+type RawSignalCase = Omit<SignalCase, "magnitude" | "phase"> & {
+  magnitude?: number[];
+  phase?: number[];
+};
+
+type RawSignalReference = Omit<SignalReference, "cases"> & {
+  cases: RawSignalCase[];
+};
+
 export type WindowDspCase = {
   type: "rect" | "hann" | "hamming" | "blackman";
   n: number;
@@ -64,25 +77,78 @@ export type WindowDspReference = {
 // Reference loaders
 // =============================================================================
 
+type SidecarRef = {
+  $sidecar: string;
+  dtype: "float64";
+  offset: number;
+  length: number;
+};
+
+const isSidecarRef = (value: unknown): value is SidecarRef =>
+  typeof value === "object" && value !== null && "$sidecar" in value;
+
+/**
+ * Read an array the generator wrote to a raw little-endian float64 sidecar
+ * (scripts/gen_reallife_refs.py --binary-sidecars).
+ */
+const readSidecar = (
+  ref: SidecarRef,
+  files: Map<string, Buffer>
+): number[] => {
+  let buf = files.get(ref.$sidecar);
+  if (!buf) {
+    buf = readFileSync(resolve(refsDir, ref.$sidecar));
+    files.set(ref.$sidecar, buf);
+  }
+  const start = ref.offset * Float64Array.BYTES_PER_ELEMENT;
+  const end = start + ref.length * Float64Array.BYTES_PER_ELEMENT;
+  // Copy into a fresh buffer: Node may hand back unaligned pooled memory.
+  const values = new Float64Array(ref.length);
+  new Uint8Array(values.buffer).set(buf.subarray(start, end));
+  return Array.from(values);
+};
+
 export const loadReference = <T>(name: string): T => {
   const path = resolve(refsDir, `${name}.json`);
-  return JSON.parse(readFileSync(path, "utf8")) as T;
+  const files = new Map<string, Buffer>();
+  return JSON.parse(readFileSync(path, "utf8"), (_key, value: unknown) =>
+    isSidecarRef(value) ? readSidecar(value, files) : value
+  ) as T;
 };
 
+/**
+ * Fill in per-bin magnitude/phase from fftRe/fftIm when the generator
+ * omitted them (the default unless run with --emit-derived).
+ */
+const withDerived = (ref: RawSignalReference): SignalReference => ({
+  ...ref,
+  cases: ref.cases.map((c) => ({
+    ...c,
+    magnitude:
+      c.magnitude ??
+      c.fftRe.map((re, i) => Math.hypot(re, c.fftIm[i] ?? 0)),
+    phase:
+      c.phase ?? c.fftRe.map((re, i) => Math.atan2(c.fftIm[i] ?? 0, re)),
+  })),
+});
+
+export const loadSignalReference = (name: string): SignalReference =>
+  withDerived(loadReference<RawSignalReference>(name));
+
 export const loadPureSine = (): SignalReference =>
-  loadReference<SignalReference>("pure_sine");
+  loadSignalReference("pure_sine");
 
 export const loadCosine = (): SignalReference =>
-  loadReference<SignalReference>("cosine");
+  loadSignalReference("cosine");
 
 export const loadMultiTone = (): SignalReference =>
-  loadReference<SignalReference>("multi_tone");
+  loadSignalReference("multi_tone");
 
 export const loadChirp = (): SignalReference =>
-  loadReference<SignalReference>("chirp");
+  loadSignalReference("chirp");
 
 export const loadSpecial = (): SignalReference =>
-  loadReference<SignalReference>("special");
+  loadSignalReference("special");
 
 export const loadWindowsDsp = (): WindowDspReference =>
   loadReference<WindowDspReference>("windows_dsp");
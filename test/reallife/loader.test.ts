@@ -0,0 +1,97 @@
+import { describe, expect, it } from "vitest";
+import {
+  expectCloseArray,
+  loadReference,
+  loadSignalReference
+} from "./helpers.js";
+import type { SignalReference } from "./helpers.js";
+
+describe("reference loader", () => {
+  describe("binary sidecars", () => {
+    // Same cases written twice by gen_reallife_refs.py: once inline, once
+    // with --binary-sidecars (arrays in loader_sine8_sidecar.f64.bin).
+    const inline = loadReference<SignalReference>("loader_sine8");
+    const sidecar = loadReference<SignalReference>("loader_sine8_sidecar");
+
+    it("decodes sidecar arrays to the same values as inline JSON", () => {
+      expect(sidecar.cases).toEqual(inline.cases);
+    });
+
+    it("resolves every sidecar reference to a plain number array", () => {
+      for (const testCase of sidecar.cases) {
+        for (const arr of [testCase.signal, testCase.fftRe, testCase.fftIm]) {
+          expect(Array.isArray(arr)).toBe(true);
+          expect(arr.length).toBe(testCase.n);
+        }
+      }
+    });
+
+    it("reads each array from its own offset", () => {
+      const [sine, cosine] = sidecar.cases;
+      const n = sidecar.n;
+      const idx = Array.from({ length: n }, (_, i) => i);
+
+      expectCloseArray(
+        sine!.signal,
+        idx.map((i) => Math.sin((2 * Math.PI * i) / n)),
+        1e-15
+      );
+      expectCloseArray(sine!.fftRe, new Array(n).fill(0), 1e-12);
+      expectCloseArray(
+        sine!.fftIm,
+        idx.map((k) => (k === 1 ? -n / 2 : k === n - 1 ? n / 2 : 0)),
+        1e-12
+      );
+
+      expectCloseArray(
+        cosine!.signal,
+        idx.map((i) => 0.5 * Math.cos((4 * Math.PI * i) / n)),
+        1e-15
+      );
+      expectCloseArray(
+        cosine!.fftRe,
+        idx.map((k) => (k === 2 || k === n - 2 ? n / 4 : 0)),
+        1e-12
+      );
+      expectCloseArray(cosine!.fftIm, new Array(n).fill(0), 1e-12);
+    });
+  });
+
+  describe("derived magnitude/phase", () => {
+    // loader_sine8.json was written without --emit-derived.
+    const raw = loadReference<{ cases: object[] }>("loader_sine8");
+    const ref = loadSignalReference("loader_sine8");
+
+    it("reads a reference without per-bin magnitude/phase", () => {
+      for (const testCase of raw.cases) {
+        expect(testCase).not.toHaveProperty("magnitude");
+        expect(testCase).not.toHaveProperty("phase");
+      }
+    });
+
+    it("fills them in from fftRe/fftIm", () => {
+      for (const testCase of ref.cases) {
+        const { fftRe, fftIm } = testCase;
+        expectCloseArray(
+          testCase.magnitude,
+          fftRe.map((re, i) => Math.hypot(re, fftIm[i]!)),
+          0
+        );
+        expectCloseArray(
+          testCase.phase,
+          fftRe.map((re, i) => Math.atan2(fftIm[i]!, re)),
+          0
+        );
+        // The generator's own peak values agree with the filled-in arrays.
+        expect(testCase.magnitude[testCase.peakBin]).toBeCloseTo(
+          testCase.peakMagnitude,
+          12
+        );
+        expect(testCase.phase[testCase.peakBin]).toBeCloseTo(
+          testCase.peakPhase,
+          12
+        );
+      }
+    });
+  });
+});